@@ -2,17 +2,28 @@ from time import perf_counter
 
 import cv2
 import numpy as np
-from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile, status
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile, status
 
-from app.core.config import Settings, get_settings
+from app.core.config import OrientationPolicy, Settings, get_settings
+from app.core.profiling import attach_input, profile_stage
 from app.ocr.engine import OcrEngine, get_engine
 from app.ocr.postprocess import extract_common_fields
-from app.ocr.schemas import OcrFieldsResponse, OcrImageResponse, OcrPdfPage, OcrPdfResponse
+from app.ocr.schemas import (
+    OcrFieldsResponse,
+    OcrImageResponse,
+    OcrPdfPage,
+    OcrPdfResponse,
+    OrientationStats,
+)
 
 router = APIRouter(prefix="/ocr", tags=["ocr"])
 
 IMAGE_TYPES = {"image/jpeg", "image/png", "image/webp"}
 PDF_TYPES = {"application/pdf"}
+ORIENTATION_DESCRIPTION = (
+    "Tratamento de orientacao: 'upright' nao classifica, 'cls' classifica cada linha, "
+    "'auto' verifica a pagina e so classifica quando ambigua. Padrao por tipo de arquivo via configuracao."
+)
 
 
 def get_ocr_engine() -> OcrEngine:
@@ -53,12 +64,14 @@ async def _validate_upload(
                 },
             },
         )
+    attach_input(content, file.content_type)
     return content
 
 
 def _decode_image(image_bytes: bytes, request_id: str) -> np.ndarray:
     image_array = np.frombuffer(image_bytes, dtype=np.uint8)
-    image = cv2.imdecode(image_array, cv2.IMREAD_COLOR)
+    with profile_stage("decode"):
+        image = cv2.imdecode(image_array, cv2.IMREAD_COLOR)
     if image is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -74,6 +87,7 @@ def _decode_image(image_bytes: bytes, request_id: str) -> np.ndarray:
 async def ocr_image(
     request: Request,
     file: UploadFile = File(...),
+    orientation: OrientationPolicy | None = Query(default=None, description=ORIENTATION_DESCRIPTION),
     engine: OcrEngine = Depends(get_ocr_engine),
     settings: Settings = Depends(get_settings),
 ) -> OcrImageResponse:
@@ -81,23 +95,28 @@ async def ocr_image(
     start = perf_counter()
     payload = await _validate_upload(file, allowed_types=IMAGE_TYPES, settings=settings, request_id=request_id)
     image = _decode_image(payload, request_id=request_id)
-    blocks = engine.ocr_image(image)
+    stats = OrientationStats(policy=orientation or settings.image_orientation)
+    blocks = engine.ocr_image(image, orientation=stats.policy, stats=stats)
     elapsed_ms = round((perf_counter() - start) * 1000, 2)
-    return OcrImageResponse(request_id=request_id, engine=engine.info, blocks=blocks, time_ms=elapsed_ms)
+    return OcrImageResponse(
+        request_id=request_id, engine=engine.info, blocks=blocks, orientation=stats, time_ms=elapsed_ms
+    )
 
 
 @router.post("/pdf", response_model=OcrPdfResponse)
 async def ocr_pdf(
     request: Request,
     file: UploadFile = File(...),
+    orientation: OrientationPolicy | None = Query(default=None, description=ORIENTATION_DESCRIPTION),
     engine: OcrEngine = Depends(get_ocr_engine),
     settings: Settings = Depends(get_settings),
 ) -> OcrPdfResponse:
     request_id = request.state.request_id
     start = perf_counter()
     payload = await _validate_upload(file, allowed_types=PDF_TYPES, settings=settings, request_id=request_id)
+    stats = OrientationStats(policy=orientation or settings.pdf_orientation)
     try:
-        pages = engine.ocr_pdf(payload)
+        pages = engine.ocr_pdf(payload, orientation=stats.policy, stats=stats)
     except ValueError as exc:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -107,13 +126,16 @@ async def ocr_pdf(
             },
         ) from exc
     elapsed_ms = round((perf_counter() - start) * 1000, 2)
-    return OcrPdfResponse(request_id=request_id, engine=engine.info, pages=pages, time_ms=elapsed_ms)
+    return OcrPdfResponse(
+        request_id=request_id, engine=engine.info, pages=pages, orientation=stats, time_ms=elapsed_ms
+    )
 
 
 @router.post("/fields", response_model=OcrFieldsResponse)
 async def ocr_fields(
     request: Request,
     file: UploadFile = File(...),
+    orientation: OrientationPolicy | None = Query(default=None, description=ORIENTATION_DESCRIPTION),
     engine: OcrEngine = Depends(get_ocr_engine),
     settings: Settings = Depends(get_settings),
 ) -> OcrFieldsResponse:
@@ -126,8 +148,9 @@ async def ocr_fields(
     pages: list[OcrPdfPage] | None = None
 
     if file.content_type in PDF_TYPES:
+        stats = OrientationStats(policy=orientation or settings.pdf_orientation)
         try:
-            pages = engine.ocr_pdf(payload)
+            pages = engine.ocr_pdf(payload, orientation=stats.policy, stats=stats)
         except ValueError as exc:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -137,11 +160,14 @@ async def ocr_fields(
                 },
             ) from exc
         merged_blocks = [block for page in pages for block in page.blocks]
-        fields = extract_common_fields(merged_blocks)
+        with profile_stage("fields"):
+            fields = extract_common_fields(merged_blocks)
     else:
         image = _decode_image(payload, request_id=request_id)
-        blocks = engine.ocr_image(image)
-        fields = extract_common_fields(blocks)
+        stats = OrientationStats(policy=orientation or settings.image_orientation)
+        blocks = engine.ocr_image(image, orientation=stats.policy, stats=stats)
+        with profile_stage("fields"):
+            fields = extract_common_fields(blocks)
 
     elapsed_ms = round((perf_counter() - start) * 1000, 2)
     return OcrFieldsResponse(
@@ -150,5 +176,6 @@ async def ocr_fields(
         blocks=blocks,
         pages=pages,
         fields=fields,
+        orientation=stats,
         time_ms=elapsed_ms,
     )
@@ -1,7 +1,10 @@
 from functools import lru_cache
+from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+OrientationPolicy = Literal["auto", "cls", "upright"]
+
 
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", case_sensitive=False)
@@ -12,6 +15,19 @@ class Settings(BaseSettings):
     pdf_max_pages: int = 10
     ocr_lang: str = "pt"
     enable_preprocess: bool = True
+    ocr_backend: Literal["paddle", "onnx"] = "paddle"
+    onnx_model_dir: str = "models/onnx"
+    onnx_intra_op_threads: int = 0
+    onnx_inter_op_threads: int = 0
+    onnx_quantized: bool = False
+    image_orientation: OrientationPolicy = "auto"
+    pdf_orientation: OrientationPolicy = "upright"
+    profile_sample_rate: float = 0.0
+    slow_request_ms: float = 10000.0
+    slow_capture_dir: str = "captures"
+    slow_capture_max_files: int = 50
+    slow_capture_include_input: bool = False
+    stack_sample_interval_ms: float = 20.0
 
     @property
     def max_upload_bytes(self) -> int:
@@ -18,6 +18,8 @@ class JsonFormatter(logging.Formatter):
             "status_code",
             "duration_ms",
             "error_code",
+            "profile",
+            "capture_file",
         ):
             value = getattr(record, key, None)
             if value is not None:
@@ -0,0 +1,198 @@
+import json
+import random
+import sys
+import threading
+import traceback
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter, sleep
+from typing import Any
+
+from app.core.config import Settings
+
+PROFILE_HEADER = "X-Profile"
+MAX_STACK_DEPTH = 40
+TOP_STACKS = 30
+
+_current_profile: ContextVar["RequestProfile | None"] = ContextVar("current_profile", default=None)
+
+
+class RequestProfile:
+    def __init__(self, request_id: str, *, report: bool, keep_input: bool = False):
+        self.request_id = request_id
+        self.report = report
+        self.keep_input = keep_input
+        self.stages: list[dict[str, Any]] = []
+        self.metadata: dict[str, Any] = {}
+        self.stacks: Counter[str] = Counter()
+        self.input: bytes | None = None
+        self._page: int | None = None
+
+    @contextmanager
+    def stage(self, name: str, page: int | None = None) -> Iterator[None]:
+        # Nested stages (e.g. backend det/rec inside a page's "ocr") inherit the enclosing page.
+        page = page if page is not None else self._page
+        outer_page, self._page = self._page, page
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            self._page = outer_page
+            entry: dict[str, Any] = {"stage": name, "ms": round((perf_counter() - started) * 1000, 2)}
+            if page is not None:
+                entry["page"] = page
+            self.stages.append(entry)
+
+    def totals(self) -> dict[str, float]:
+        totals: dict[str, float] = {}
+        for entry in self.stages:
+            totals[entry["stage"]] = round(totals.get(entry["stage"], 0.0) + entry["ms"], 2)
+        return totals
+
+    def server_timing(self) -> str:
+        return ", ".join(f"{name};dur={ms}" for name, ms in self.totals().items())
+
+    def to_dict(self) -> dict[str, Any]:
+        metadata = dict(self.metadata)
+        if "pages" in metadata:
+            metadata["pages"] = list(metadata["pages"].values())
+        return {"totals": self.totals(), "stages": self.stages, "metadata": metadata}
+
+
+def should_profile(header_value: str | None, sample_rate: float) -> bool:
+    if header_value is not None and header_value.strip().lower() in {"1", "true", "yes"}:
+        return True
+    return sample_rate > 0 and random.random() < sample_rate
+
+
+def activate_profile(profile: RequestProfile) -> Token:
+    return _current_profile.set(profile)
+
+
+def deactivate_profile(token: Token) -> None:
+    _current_profile.reset(token)
+
+
+@contextmanager
+def profile_stage(name: str, page: int | None = None) -> Iterator[None]:
+    profile = _current_profile.get()
+    if profile is None:
+        yield
+        return
+    with profile.stage(name, page):
+        yield
+
+
+def annotate_profile(**values: Any) -> None:
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.metadata.update(values)
+
+
+def annotate_page(page: int, **values: Any) -> None:
+    profile = _current_profile.get()
+    if profile is not None:
+        pages = profile.metadata.setdefault("pages", {})
+        pages.setdefault(page, {"page": page}).update(values)
+
+
+def attach_input(payload: bytes, content_type: str | None) -> None:
+    profile = _current_profile.get()
+    if profile is None:
+        return
+    profile.metadata.update(content_type=content_type, input_bytes=len(payload))
+    if profile.keep_input:
+        profile.input = payload
+
+
+def _collapse_stack(frame) -> str:
+    return ";".join(
+        f"{Path(entry.filename).name}:{entry.name}:{entry.lineno}"
+        for entry in traceback.extract_stack(frame, limit=MAX_STACK_DEPTH)
+    )
+
+
+class StackSampler:
+    # One daemon thread samples the threads serving registered requests. OCR runs inline on the event loop,
+    # so requests overlapping on the same thread share samples; captures are diagnostic, not exact.
+    def __init__(self, interval_ms: float):
+        self.interval = interval_ms / 1000
+        self._targets: dict[int, list[RequestProfile]] = {}
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def register(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._targets.setdefault(threading.get_ident(), []).append(profile)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+                self._thread.start()
+
+    def unregister(self, profile: RequestProfile) -> None:
+        with self._lock:
+            for thread_id, profiles in list(self._targets.items()):
+                if profile in profiles:
+                    profiles.remove(profile)
+                if not profiles:
+                    del self._targets[thread_id]
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                if not self._targets:
+                    self._thread = None
+                    return
+                frames = sys._current_frames()
+                targets = [(frames.get(thread_id), list(profiles)) for thread_id, profiles in self._targets.items()]
+            # Stack walks (and their linecache lookups) run outside the lock so register/unregister on the
+            # event loop never wait for them.
+            for frame, profiles in targets:
+                if frame is None:
+                    continue
+                stack = _collapse_stack(frame)
+                for profile in profiles:
+                    profile.stacks[stack] += 1
+            del frames, targets
+            sleep(self.interval)
+
+
+def write_capture(profile: RequestProfile, settings: Settings, **request_info: Any) -> Path:
+    directory = Path(settings.slow_capture_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    stem = f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S%f}_{profile.request_id}"
+    # The sampler may still be adding its last in-flight sample; work on a snapshot.
+    stacks = Counter(dict(profile.stacks))
+
+    payload: dict[str, Any] = {
+        "request_id": profile.request_id,
+        **request_info,
+        "settings": {
+            "ocr_backend": settings.ocr_backend,
+            "enable_preprocess": settings.enable_preprocess,
+            "image_orientation": settings.image_orientation,
+            "pdf_orientation": settings.pdf_orientation,
+        },
+        **profile.to_dict(),
+        "stack_samples": sum(stacks.values()),
+        "stacks": [{"stack": stack, "count": count} for stack, count in stacks.most_common(TOP_STACKS)],
+    }
+    if profile.input is not None:
+        input_path = directory / f"{stem}.input"
+        input_path.write_bytes(profile.input)
+        payload["input_file"] = input_path.name
+
+    capture_path = directory / f"{stem}.json"
+    capture_path.write_text(json.dumps(payload, ensure_ascii=True, indent=2, default=str), encoding="utf-8")
+    _prune_captures(directory, settings.slow_capture_max_files)
+    return capture_path
+
+
+def _prune_captures(directory: Path, max_files: int) -> None:
+    captures = sorted(directory.glob("*.json"))
+    for stale in captures[: max(len(captures) - max_files, 0)]:
+        stale.unlink(missing_ok=True)
+        stale.with_suffix(".input").unlink(missing_ok=True)
@@ -11,10 +11,20 @@ from app.api.routes.health import router as health_router
 from app.api.routes.ocr import router as ocr_router
 from app.core.config import get_settings
 from app.core.logging import get_logger, setup_logging
+from app.core.profiling import (
+    PROFILE_HEADER,
+    RequestProfile,
+    StackSampler,
+    activate_profile,
+    deactivate_profile,
+    should_profile,
+    write_capture,
+)
 
 settings = get_settings()
 setup_logging()
 logger = get_logger(__name__)
+stack_sampler = StackSampler(interval_ms=settings.stack_sample_interval_ms)
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -31,6 +41,15 @@ app.state.started_at = datetime.now(timezone.utc)
 async def request_context_middleware(request: Request, call_next):
     request_id = str(uuid.uuid4())
     request.state.request_id = request_id
+    profile = RequestProfile(
+        request_id,
+        report=should_profile(request.headers.get(PROFILE_HEADER), settings.profile_sample_rate),
+        keep_input=settings.slow_capture_include_input,
+    )
+    capture_slow = settings.slow_request_ms > 0
+    token = activate_profile(profile)
+    if capture_slow:
+        stack_sampler.register(profile)
     started = perf_counter()
     response = None
     try:
@@ -38,6 +57,9 @@ async def request_context_middleware(request: Request, call_next):
         return response
     finally:
         duration_ms = round((perf_counter() - started) * 1000, 2)
+        if capture_slow:
+            stack_sampler.unregister(profile)
+        deactivate_profile(token)
         status_code = response.status_code if response else 500
         logger.info(
             "Request completed",
@@ -49,9 +71,29 @@ async def request_context_middleware(request: Request, call_next):
                 "duration_ms": duration_ms,
             },
         )
+        if profile.report:
+            logger.info("Request profile", extra={"request_id": request_id, "profile": profile.to_dict()})
+        if capture_slow and duration_ms >= settings.slow_request_ms:
+            try:
+                capture_path = write_capture(
+                    profile,
+                    settings,
+                    method=request.method,
+                    path=request.url.path,
+                    status_code=status_code,
+                    duration_ms=duration_ms,
+                )
+                logger.warning(
+                    "Slow request captured",
+                    extra={"request_id": request_id, "duration_ms": duration_ms, "capture_file": str(capture_path)},
+                )
+            except OSError:
+                logger.exception("Slow request capture failed", extra={"request_id": request_id})
         if response is not None:
             response.headers["X-Request-ID"] = request_id
             response.headers["X-Process-Time-MS"] = str(duration_ms)
+            if profile.report:
+                response.headers["Server-Timing"] = profile.server_timing()
 
 
 def _error_payload(request: Request, *, code: str, message: str) -> dict:
@@ -0,0 +1,88 @@
+from typing import Protocol
+
+import cv2
+import numpy as np
+
+from app.core.config import OrientationPolicy, Settings
+from app.core.profiling import profile_stage
+from app.ocr.orientation import OrientationPath, orient_crops
+
+RawLine = tuple[list[list[float]], str, float]
+
+
+class OcrBackend(Protocol):
+    @property
+    def info(self) -> str: ...
+
+    def run(
+        self, image: np.ndarray, *, orientation: OrientationPolicy = "cls"
+    ) -> tuple[list[RawLine], OrientationPath]: ...
+
+
+class PaddleBackend:
+    def __init__(self, settings: Settings):
+        from paddleocr import PaddleOCR
+        from paddleocr.tools.infer.predict_system import sorted_boxes
+        from paddleocr.tools.infer.utility import get_rotate_crop_image
+
+        self.settings = settings
+        self._ocr = PaddleOCR(use_angle_cls=True, lang=settings.ocr_lang, use_gpu=False, show_log=False)
+        self._sorted_boxes = sorted_boxes
+        self._crop = get_rotate_crop_image
+
+    @property
+    def info(self) -> str:
+        return f"PaddleOCR(lang={self.settings.ocr_lang},cpu)"
+
+    def run(
+        self, image: np.ndarray, *, orientation: OrientationPolicy = "cls"
+    ) -> tuple[list[RawLine], OrientationPath]:
+        if orientation == "auto":
+            return self._run_auto(image)
+        result = self._ocr.ocr(image, cls=orientation == "cls")
+        lines = result[0] if result and result[0] else []
+        if not lines:
+            return [], "skipped"
+        raw: list[RawLine] = []
+        for line in lines:
+            if not line or len(line) < 2:
+                continue
+            bbox, detail = line
+            text = str(detail[0]) if isinstance(detail, (list, tuple)) and detail else ""
+            confidence = float(detail[1]) if isinstance(detail, (list, tuple)) and len(detail) > 1 else 0.0
+            raw.append(([[float(point[0]), float(point[1])] for point in bbox], text, confidence))
+        return raw, "classified" if orientation == "cls" else "skipped"
+
+    def _run_auto(self, image: np.ndarray) -> tuple[list[RawLine], OrientationPath]:
+        # Same pipeline as PaddleOCR's TextSystem, with the page-level orientation check between det and rec.
+        if image.ndim == 2:
+            image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+        with profile_stage("det"):
+            dt_boxes, _ = self._ocr.text_detector(image)
+        if dt_boxes is None or len(dt_boxes) == 0:
+            return [], "skipped"
+        boxes = self._sorted_boxes(dt_boxes)
+        crops = [self._crop(image, box.copy()) for box in boxes]
+        with profile_stage("cls"):
+            boxes, crops, path = orient_crops(boxes, crops, self._classify, "auto")
+        with profile_stage("rec"):
+            rec_res, _ = self._ocr.text_recognizer(crops)
+
+        raw: list[RawLine] = []
+        for box, (text, confidence) in zip(boxes, rec_res):
+            if confidence < self._ocr.drop_score:
+                continue
+            raw.append(([[float(point[0]), float(point[1])] for point in box], str(text), float(confidence)))
+        return raw, path
+
+    def _classify(self, crops: list[np.ndarray]) -> list[tuple[str, float]]:
+        _, cls_res, _ = self._ocr.text_classifier(list(crops))
+        return [(str(label), float(score)) for label, score in cls_res]
+
+
+def create_backend(settings: Settings) -> OcrBackend:
+    if settings.ocr_backend == "onnx":
+        from app.ocr.onnx_backend import OnnxBackend
+
+        return OnnxBackend(settings)
+    return PaddleBackend(settings)
@@ -4,20 +4,20 @@ import cv2
 import numpy as np
 import pypdfium2 as pdfium
 
-from app.core.config import Settings, get_settings
-from app.ocr.schemas import Block, OcrPdfPage
+from app.core.config import OrientationPolicy, Settings, get_settings
+from app.core.profiling import annotate_page, annotate_profile, profile_stage
+from app.ocr.backends import OcrBackend, RawLine, create_backend
+from app.ocr.schemas import Block, OcrPdfPage, OrientationStats
 
 
 class OcrEngine:
-    def __init__(self, settings: Settings):
-        from paddleocr import PaddleOCR
-
+    def __init__(self, settings: Settings, backend: OcrBackend | None = None):
         self.settings = settings
-        self._ocr = PaddleOCR(use_angle_cls=True, lang=settings.ocr_lang, use_gpu=False, show_log=False)
+        self._backend = backend or create_backend(settings)
 
     @property
     def info(self) -> str:
-        return f"PaddleOCR(lang={self.settings.ocr_lang},cpu)"
+        return self._backend.info
 
     def _preprocess(self, image: np.ndarray) -> np.ndarray:
         if not self.settings.enable_preprocess:
@@ -26,17 +26,24 @@ class OcrEngine:
         denoised = cv2.fastNlMeansDenoising(gray, h=12)
         return denoised
 
-    def ocr_image(self, image: np.ndarray) -> list[Block]:
-        processed = self._preprocess(image)
-        result = self._ocr.ocr(processed, cls=True)
-        lines = result[0] if result else []
+    def _run_backend(
+        self, image: np.ndarray, policy: OrientationPolicy, stats: OrientationStats | None, page: int
+    ) -> list[RawLine]:
+        with profile_stage("ocr", page):
+            lines, path = self._backend.run(image, orientation=policy)
+        if stats is not None:
+            setattr(stats, path, getattr(stats, path) + 1)
+        annotate_page(page, orientation=path)
+        return lines
+
+    def _recognize(
+        self, image: np.ndarray, policy: OrientationPolicy, stats: OrientationStats | None, page: int = 1
+    ) -> list[Block]:
+        annotate_page(page, width=image.shape[1], height=image.shape[0])
+        with profile_stage("preprocess", page):
+            processed = self._preprocess(image)
         blocks: list[Block] = []
-        for line in lines:
-            if not line or len(line) < 2:
-                continue
-            bbox, detail = line
-            text = str(detail[0]) if isinstance(detail, (list, tuple)) and detail else ""
-            confidence = float(detail[1]) if isinstance(detail, (list, tuple)) and len(detail) > 1 else 0.0
+        for bbox, text, confidence in self._run_backend(processed, policy, stats, page):
             blocks.append(
                 Block(
                     bbox=[[float(point[0]), float(point[1])] for point in bbox],
@@ -46,7 +53,26 @@ class OcrEngine:
             )
         return blocks
 
-    def ocr_pdf(self, pdf_bytes: bytes) -> list[OcrPdfPage]:
+    def ocr_image(
+        self,
+        image: np.ndarray,
+        *,
+        orientation: OrientationPolicy | None = None,
+        stats: OrientationStats | None = None,
+    ) -> list[Block]:
+        policy = orientation or self.settings.image_orientation
+        annotate_profile(
+            engine=self.info, enable_preprocess=self.settings.enable_preprocess, orientation=policy, page_count=1
+        )
+        return self._recognize(image, policy, stats)
+
+    def ocr_pdf(
+        self,
+        pdf_bytes: bytes,
+        *,
+        orientation: OrientationPolicy | None = None,
+        stats: OrientationStats | None = None,
+    ) -> list[OcrPdfPage]:
         document = pdfium.PdfDocument(pdf_bytes)
         total_pages = len(document)
         if total_pages > self.settings.pdf_max_pages:
@@ -54,12 +80,20 @@ class OcrEngine:
                 f"PDF possui {total_pages} paginas e excede o limite permitido de {self.settings.pdf_max_pages}."
             )
 
+        policy = orientation or self.settings.pdf_orientation
+        annotate_profile(
+            engine=self.info,
+            enable_preprocess=self.settings.enable_preprocess,
+            orientation=policy,
+            page_count=total_pages,
+        )
         pages: list[OcrPdfPage] = []
         for index in range(total_pages):
             page = document[index]
-            bitmap = page.render(scale=2.0).to_numpy()
-            image = cv2.cvtColor(bitmap, cv2.COLOR_RGB2BGR)
-            blocks = self.ocr_image(image)
+            with profile_stage("render", index + 1):
+                bitmap = page.render(scale=2.0).to_numpy()
+                image = cv2.cvtColor(bitmap, cv2.COLOR_RGB2BGR)
+            blocks = self._recognize(image, policy, stats, page=index + 1)
             pages.append(OcrPdfPage(page=index + 1, blocks=blocks))
         return pages
 
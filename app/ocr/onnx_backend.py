@@ -0,0 +1,232 @@
+import math
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from app.core.config import OrientationPolicy, Settings
+from app.core.profiling import profile_stage
+from app.ocr.backends import RawLine
+from app.ocr.orientation import OrientationPath, orient_crops
+
+DET_LIMIT_SIDE = 960
+DET_THRESH = 0.3
+DET_BOX_THRESH = 0.6
+DET_UNCLIP_RATIO = 1.5
+DET_MAX_CANDIDATES = 1000
+DET_MIN_SIZE = 3
+CLS_IMAGE_SHAPE = (48, 192)
+CLS_LABELS = ("0", "180")
+REC_IMAGE_SHAPE = (48, 320)
+BATCH_SIZE = 6
+DROP_SCORE = 0.5
+
+DET_MEAN = np.array([0.485, 0.456, 0.406], dtype=np.float32)
+DET_STD = np.array([0.229, 0.224, 0.225], dtype=np.float32)
+
+
+def _model_path(model_dir: Path, name: str, quantized: bool) -> Path:
+    filename = f"{name}_int8.onnx" if quantized else f"{name}.onnx"
+    path = model_dir / filename
+    if not path.is_file():
+        raise FileNotFoundError(f"Modelo ONNX nao encontrado: {path}. Execute scripts/export_onnx_models.py.")
+    return path
+
+
+def load_character_dict(path: Path) -> list[str]:
+    with path.open("r", encoding="utf-8") as handle:
+        characters = [line.rstrip("\r\n") for line in handle]
+    # Same layout as PaddleOCR's CTCLabelDecode: blank at index 0 and the space char at the end.
+    return ["blank", *characters, " "]
+
+
+def ctc_decode(preds: np.ndarray, characters: list[str]) -> list[tuple[str, float]]:
+    indices = preds.argmax(axis=2)
+    probs = preds.max(axis=2)
+    results: list[tuple[str, float]] = []
+    for seq_indices, seq_probs in zip(indices, probs):
+        selection = np.ones(len(seq_indices), dtype=bool)
+        selection[1:] = seq_indices[1:] != seq_indices[:-1]
+        selection &= seq_indices != 0
+        text = "".join(characters[index] for index in seq_indices[selection] if index < len(characters))
+        confidence = float(seq_probs[selection].mean()) if selection.any() else 0.0
+        results.append((text, confidence))
+    return results
+
+
+def _mini_box(points: np.ndarray) -> tuple[np.ndarray, float]:
+    rect = cv2.minAreaRect(points)
+    box = sorted(cv2.boxPoints(rect).tolist(), key=lambda point: point[0])
+    left_top, left_bottom = (box[0], box[1]) if box[1][1] > box[0][1] else (box[1], box[0])
+    right_top, right_bottom = (box[2], box[3]) if box[3][1] > box[2][1] else (box[3], box[2])
+    return np.array([left_top, right_top, right_bottom, left_bottom], dtype=np.float32), min(rect[1])
+
+
+def _box_score(pred: np.ndarray, box: np.ndarray) -> float:
+    height, width = pred.shape
+    xmin = int(np.clip(np.floor(box[:, 0].min()), 0, width - 1))
+    xmax = int(np.clip(np.ceil(box[:, 0].max()), 0, width - 1))
+    ymin = int(np.clip(np.floor(box[:, 1].min()), 0, height - 1))
+    ymax = int(np.clip(np.ceil(box[:, 1].max()), 0, height - 1))
+    mask = np.zeros((ymax - ymin + 1, xmax - xmin + 1), dtype=np.uint8)
+    shifted = box.copy()
+    shifted[:, 0] -= xmin
+    shifted[:, 1] -= ymin
+    cv2.fillPoly(mask, shifted.reshape(1, -1, 2).astype(np.int32), 1)
+    return cv2.mean(pred[ymin : ymax + 1, xmin : xmax + 1], mask)[0]
+
+
+def _unclip(box: np.ndarray) -> np.ndarray:
+    # Offsetting a quadrilateral by `distance` and taking its min-area rect (what PaddleOCR does with
+    # pyclipper) is equivalent to growing the rect by `distance` on every side.
+    distance = cv2.contourArea(box) * DET_UNCLIP_RATIO / max(cv2.arcLength(box, True), 1e-6)
+    (center_x, center_y), (width, height), angle = cv2.minAreaRect(box)
+    rect = ((center_x, center_y), (width + 2 * distance, height + 2 * distance), angle)
+    return cv2.boxPoints(rect)
+
+
+def db_postprocess(pred: np.ndarray, dest_width: int, dest_height: int) -> list[np.ndarray]:
+    height, width = pred.shape
+    bitmap = (pred > DET_THRESH).astype(np.uint8) * 255
+    contours, _ = cv2.findContours(bitmap, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)
+    boxes: list[np.ndarray] = []
+    for contour in contours[:DET_MAX_CANDIDATES]:
+        points, short_side = _mini_box(contour)
+        if short_side < DET_MIN_SIZE:
+            continue
+        if _box_score(pred, points) < DET_BOX_THRESH:
+            continue
+        box, short_side = _mini_box(_unclip(points))
+        if short_side < DET_MIN_SIZE + 2:
+            continue
+        box[:, 0] = np.clip(np.round(box[:, 0] / width * dest_width), 0, dest_width - 1)
+        box[:, 1] = np.clip(np.round(box[:, 1] / height * dest_height), 0, dest_height - 1)
+        box_width = int(np.linalg.norm(box[0] - box[1]))
+        box_height = int(np.linalg.norm(box[0] - box[3]))
+        if box_width <= 3 or box_height <= 3:
+            continue
+        boxes.append(box)
+    return _sort_boxes(boxes)
+
+
+def _sort_boxes(boxes: list[np.ndarray]) -> list[np.ndarray]:
+    ordered = sorted(boxes, key=lambda box: (box[0][1], box[0][0]))
+    for index in range(len(ordered) - 1):
+        for current in range(index, -1, -1):
+            same_line = abs(ordered[current + 1][0][1] - ordered[current][0][1]) < 10
+            if same_line and ordered[current + 1][0][0] < ordered[current][0][0]:
+                ordered[current], ordered[current + 1] = ordered[current + 1], ordered[current]
+            else:
+                break
+    return ordered
+
+
+def _crop(image: np.ndarray, box: np.ndarray) -> np.ndarray:
+    width = int(max(np.linalg.norm(box[0] - box[1]), np.linalg.norm(box[2] - box[3])))
+    height = int(max(np.linalg.norm(box[0] - box[3]), np.linalg.norm(box[1] - box[2])))
+    target = np.array([[0, 0], [width, 0], [width, height], [0, height]], dtype=np.float32)
+    matrix = cv2.getPerspectiveTransform(box.astype(np.float32), target)
+    crop = cv2.warpPerspective(image, matrix, (width, height), borderMode=cv2.BORDER_REPLICATE, flags=cv2.INTER_CUBIC)
+    if crop.shape[0] / max(crop.shape[1], 1) >= 1.5:
+        crop = np.rot90(crop)
+    return crop
+
+
+def _resize_norm(image: np.ndarray, height: int, max_width: int) -> np.ndarray:
+    ratio = image.shape[1] / max(image.shape[0], 1)
+    resized_width = max(min(math.ceil(height * ratio), max_width), 1)
+    resized = cv2.resize(image, (resized_width, height)).astype(np.float32)
+    resized = (resized / 255.0 - 0.5) / 0.5
+    padded = np.zeros((3, height, max_width), dtype=np.float32)
+    padded[:, :, :resized_width] = resized.transpose(2, 0, 1)
+    return padded
+
+
+class OnnxBackend:
+    def __init__(self, settings: Settings):
+        import onnxruntime as ort
+
+        self.settings = settings
+        model_dir = Path(settings.onnx_model_dir)
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = settings.onnx_intra_op_threads
+        options.inter_op_num_threads = settings.onnx_inter_op_threads
+        if settings.onnx_inter_op_threads > 1:
+            options.execution_mode = ort.ExecutionMode.ORT_PARALLEL
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        providers = ["CPUExecutionProvider"]
+        quantized = settings.onnx_quantized
+
+        self._det = ort.InferenceSession(str(_model_path(model_dir, "det", quantized)), options, providers=providers)
+        self._cls = ort.InferenceSession(str(_model_path(model_dir, "cls", quantized)), options, providers=providers)
+        self._rec = ort.InferenceSession(str(_model_path(model_dir, "rec", quantized)), options, providers=providers)
+        self._det_input = self._det.get_inputs()[0].name
+        self._cls_input = self._cls.get_inputs()[0].name
+        self._rec_input = self._rec.get_inputs()[0].name
+        self._characters = load_character_dict(model_dir / "dict.txt")
+
+    @property
+    def info(self) -> str:
+        precision = "int8" if self.settings.onnx_quantized else "fp32"
+        return f"OnnxRuntime(lang={self.settings.ocr_lang},cpu,{precision})"
+
+    def run(
+        self, image: np.ndarray, *, orientation: OrientationPolicy = "cls"
+    ) -> tuple[list[RawLine], OrientationPath]:
+        if image.ndim == 2:
+            image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+        with profile_stage("det"):
+            boxes = self._detect(image)
+        if not boxes:
+            return [], "skipped"
+        crops = [_crop(image, box) for box in boxes]
+        with profile_stage("cls"):
+            boxes, crops, path = orient_crops(boxes, crops, self._classify, orientation)
+        with profile_stage("rec"):
+            recognized = self._recognize(crops)
+
+        raw: list[RawLine] = []
+        for box, (text, confidence) in zip(boxes, recognized):
+            if confidence < DROP_SCORE:
+                continue
+            raw.append((box.tolist(), text, confidence))
+        return raw, path
+
+    def _detect(self, image: np.ndarray) -> list[np.ndarray]:
+        height, width = image.shape[:2]
+        ratio = min(DET_LIMIT_SIDE / max(height, width), 1.0)
+        resized_height = max(int(round(int(height * ratio) / 32) * 32), 32)
+        resized_width = max(int(round(int(width * ratio) / 32) * 32), 32)
+        resized = cv2.resize(image, (resized_width, resized_height)).astype(np.float32)
+        normalized = (resized / 255.0 - DET_MEAN) / DET_STD
+        batch = normalized.transpose(2, 0, 1)[np.newaxis].astype(np.float32)
+        pred = self._det.run(None, {self._det_input: batch})[0][0, 0]
+        return db_postprocess(pred, width, height)
+
+    def _classify(self, crops: list[np.ndarray]) -> list[tuple[str, float]]:
+        height, width = CLS_IMAGE_SHAPE
+        results: list[tuple[str, float]] = [("0", 0.0)] * len(crops)
+        order = np.argsort([crop.shape[1] / max(crop.shape[0], 1) for crop in crops])
+        for start in range(0, len(crops), BATCH_SIZE):
+            indices = order[start : start + BATCH_SIZE]
+            batch = np.stack([_resize_norm(crops[index], height, width) for index in indices])
+            probs = self._cls.run(None, {self._cls_input: batch})[0]
+            for index, prob in zip(indices, probs):
+                label = int(prob.argmax())
+                results[index] = (CLS_LABELS[label], float(prob[label]))
+        return results
+
+    def _recognize(self, crops: list[np.ndarray]) -> list[tuple[str, float]]:
+        height, base_width = REC_IMAGE_SHAPE
+        results: list[tuple[str, float]] = [("", 0.0)] * len(crops)
+        ratios = [crop.shape[1] / max(crop.shape[0], 1) for crop in crops]
+        order = np.argsort(ratios)
+        for start in range(0, len(crops), BATCH_SIZE):
+            indices = order[start : start + BATCH_SIZE]
+            max_ratio = max(base_width / height, *(ratios[index] for index in indices))
+            width = int(height * max_ratio)
+            batch = np.stack([_resize_norm(crops[index], height, width) for index in indices])
+            preds = self._rec.run(None, {self._rec_input: batch})[0]
+            for index, decoded in zip(indices, ctc_decode(preds, self._characters)):
+                results[index] = decoded
+        return results
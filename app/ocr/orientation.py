@@ -0,0 +1,51 @@
+from collections.abc import Callable
+from typing import Literal
+
+import cv2
+import numpy as np
+
+from app.core.config import OrientationPolicy
+
+OrientationPath = Literal["skipped", "upright", "rotated", "classified"]
+PageOrientation = Literal["upright", "rotated"]
+Classifier = Callable[[list[np.ndarray]], list[tuple[str, float]]]
+
+CONSENSUS_CROPS = 3
+CONSENSUS_MIN_SCORE = 0.9
+CLS_THRESH = 0.9
+
+
+def page_orientation(crops: list[np.ndarray], classify: Classifier) -> PageOrientation | None:
+    # The widest crops carry the most glyphs, so the angle classifier is most reliable on them. A page is
+    # upright or rotated only when all of them agree with high confidence; otherwise it is ambiguous.
+    widest = sorted(range(len(crops)), key=lambda index: crops[index].shape[1], reverse=True)[:CONSENSUS_CROPS]
+    predictions = classify([crops[index] for index in widest])
+    if not predictions or any(score < CONSENSUS_MIN_SCORE for _, score in predictions):
+        return None
+    labels = {label for label, _ in predictions}
+    if labels == {"0"}:
+        return "upright"
+    if labels == {"180"}:
+        return "rotated"
+    return None
+
+
+def orient_crops(
+    boxes: list, crops: list[np.ndarray], classify: Classifier, policy: OrientationPolicy
+) -> tuple[list, list[np.ndarray], OrientationPath]:
+    if policy == "upright" or not crops:
+        return boxes, crops, "skipped"
+    if policy == "auto":
+        orientation = page_orientation(crops, classify)
+        if orientation == "upright":
+            return boxes, crops, "upright"
+        if orientation == "rotated":
+            # Boxes were sorted on the upside-down page; reversing restores reading order.
+            rotated = [cv2.rotate(crop, cv2.ROTATE_180) for crop in reversed(crops)]
+            return list(reversed(boxes)), rotated, "rotated"
+
+    oriented = list(crops)
+    for index, (label, score) in enumerate(classify(crops)):
+        if label == "180" and score > CLS_THRESH:
+            oriented[index] = cv2.rotate(oriented[index], cv2.ROTATE_180)
+    return boxes, oriented, "classified"
@@ -1,5 +1,7 @@
 from pydantic import BaseModel, Field
 
+from app.core.config import OrientationPolicy
+
 
 class Block(BaseModel):
     bbox: list[list[float]]
@@ -7,10 +9,19 @@ class Block(BaseModel):
     confidence: float = Field(ge=0.0, le=1.0)
 
 
+class OrientationStats(BaseModel):
+    policy: OrientationPolicy
+    skipped: int = 0
+    upright: int = 0
+    rotated: int = 0
+    classified: int = 0
+
+
 class OcrImageResponse(BaseModel):
     request_id: str
     engine: str
     blocks: list[Block]
+    orientation: OrientationStats | None = None
     time_ms: float
 
 
@@ -23,6 +34,7 @@ class OcrPdfResponse(BaseModel):
     request_id: str
     engine: str
     pages: list[OcrPdfPage]
+    orientation: OrientationStats | None = None
     time_ms: float
 
 
@@ -37,4 +49,5 @@ class OcrFieldsResponse(BaseModel):
     blocks: list[Block] | None = None
     pages: list[OcrPdfPage] | None = None
     fields: dict[str, ExtractedField | None]
+    orientation: OrientationStats | None = None
     time_ms: float
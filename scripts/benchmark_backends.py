@@ -0,0 +1,57 @@
+import argparse
+from difflib import SequenceMatcher
+from pathlib import Path
+from time import perf_counter
+
+import cv2
+
+from app.core.config import get_settings
+from app.ocr.engine import OcrEngine
+
+SAMPLES_DIR = Path(__file__).resolve().parent.parent / "samples"
+BACKENDS = {
+    "paddle": {"ocr_backend": "paddle"},
+    "onnx": {"ocr_backend": "onnx", "onnx_quantized": False},
+    "onnx-int8": {"ocr_backend": "onnx", "onnx_quantized": True},
+}
+
+
+def _run_sample(engine: OcrEngine, sample: Path) -> str:
+    if sample.suffix == ".pdf":
+        pages = engine.ocr_pdf(sample.read_bytes())
+        return "\n".join(block.text for page in pages for block in page.blocks)
+    blocks = engine.ocr_image(cv2.imread(str(sample)))
+    return "\n".join(block.text for block in blocks)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compara texto e throughput dos backends OCR nas amostras.")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=list(BACKENDS))
+    parser.add_argument("--iterations", type=int, default=5)
+    args = parser.parse_args()
+
+    settings = get_settings()
+    samples = sorted(path for path in SAMPLES_DIR.iterdir() if path.suffix in {".jpg", ".png", ".pdf"})
+    reference: dict[str, str] = {}
+
+    for name in args.backends:
+        engine = OcrEngine(settings=settings.model_copy(update=BACKENDS[name]))
+        texts = {sample.name: _run_sample(engine, sample) for sample in samples}
+        reference = reference or texts
+
+        started = perf_counter()
+        for _ in range(args.iterations):
+            for sample in samples:
+                _run_sample(engine, sample)
+        elapsed = perf_counter() - started
+        runs = args.iterations * len(samples)
+
+        print(f"[{name}] {engine.info}")
+        print(f"  {runs / elapsed:.2f} docs/s, {elapsed / runs * 1000:.1f} ms/doc")
+        for sample_name, text in texts.items():
+            similarity = SequenceMatcher(None, reference[sample_name], text).ratio()
+            print(f"  {sample_name}: similaridade={similarity:.3f} com {args.backends[0]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+import argparse
+import shutil
+import subprocess
+from pathlib import Path
+
+from app.core.config import get_settings
+
+
+def _paddle_model_dirs(lang: str) -> tuple[dict[str, Path], Path]:
+    import paddleocr
+    from paddleocr.paddleocr import BASE_DIR, DEFAULT_OCR_MODEL_VERSION, MODEL_URLS, parse_lang
+
+    rec_lang, det_lang = parse_lang(lang)
+    whl = Path(BASE_DIR) / "whl"
+    search_roots = {"det": whl / "det" / det_lang, "cls": whl / "cls", "rec": whl / "rec" / rec_lang}
+    model_dirs: dict[str, Path] = {}
+    for kind, root in search_roots.items():
+        found = sorted(root.rglob("inference.pdmodel"))
+        if not found:
+            raise FileNotFoundError(f"Modelo Paddle '{kind}' nao encontrado em {root}. Rode scripts/download_models.py.")
+        model_dirs[kind] = found[0].parent
+
+    dict_path = MODEL_URLS["OCR"][DEFAULT_OCR_MODEL_VERSION]["rec"][rec_lang]["dict_path"]
+    return model_dirs, Path(paddleocr.__file__).parent / dict_path.removeprefix("./")
+
+
+def _export(source: Path, target: Path) -> None:
+    subprocess.run(
+        [
+            "paddle2onnx",
+            "--model_dir",
+            str(source),
+            "--model_filename",
+            "inference.pdmodel",
+            "--params_filename",
+            "inference.pdiparams",
+            "--save_file",
+            str(target),
+            "--opset_version",
+            "14",
+        ],
+        check=True,
+    )
+
+
+def _quantize(source: Path, target: Path) -> None:
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from onnxruntime.quantization.shape_inference import quant_pre_process
+
+    # Graphs exported by paddle2onnx need constant folding before the quantizer sees conv weights as initializers.
+    prepared = source.with_name(f"{source.stem}_prep.onnx")
+    quant_pre_process(str(source), str(prepared), skip_symbolic_shape=True)
+    try:
+        quantize_dynamic(str(prepared), str(target), weight_type=QuantType.QUInt8)
+    finally:
+        prepared.unlink(missing_ok=True)
+
+
+def main() -> None:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Converte os modelos PaddleOCR (det/cls/rec) para ONNX.")
+    parser.add_argument("--output", default=settings.onnx_model_dir)
+    parser.add_argument("--quantize", action="store_true", help="Gera tambem as variantes INT8 (*_int8.onnx).")
+    args = parser.parse_args()
+
+    output = Path(args.output)
+    output.mkdir(parents=True, exist_ok=True)
+    model_dirs, dict_path = _paddle_model_dirs(settings.ocr_lang)
+    for kind, source in model_dirs.items():
+        target = output / f"{kind}.onnx"
+        _export(source, target)
+        if args.quantize:
+            _quantize(target, output / f"{kind}_int8.onnx")
+    shutil.copyfile(dict_path, output / "dict.txt")
+    print(f"Modelos ONNX prontos em {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+
+from app.core.config import Settings, get_settings
+from app.ocr.backends import PaddleBackend
+from app.ocr.engine import OcrEngine
+from app.ocr.onnx_backend import _crop, _mini_box, _sort_boxes, _unclip, ctc_decode, db_postprocess
+from app.ocr.orientation import orient_crops
+from app.ocr.schemas import OrientationStats
+
+SAMPLES_DIR = Path(__file__).resolve().parent.parent / "samples"
+ONNX_MODELS = Path(get_settings().onnx_model_dir) / "det.onnx"
+
+
+class FakeBackend:
+    info = "FakeOCR(cpu)"
+    paths = {"upright": "skipped", "cls": "classified", "auto": "rotated"}
+
+    def __init__(self):
+        self.policies: list[str] = []
+
+    def run(self, _image, *, orientation="cls"):
+        self.policies.append(orientation)
+        return [([[0, 0], [50, 0], [50, 10], [0, 10]], " TOTAL 10,00 ", 1.7)], self.paths[orientation]
+
+
+class FakeClassifier:
+    def __init__(self, predictions):
+        self.predictions = predictions
+        self.calls: list[list[int]] = []
+
+    def __call__(self, crops):
+        self.calls.append([crop.shape[1] for crop in crops])
+        return [self.predictions[crop.shape[1]] for crop in crops]
+
+
+class FakePaddleOCR:
+    drop_score = 0.5
+
+    def __init__(self, widths=(), labels=None, scores=None, ocr_result=None):
+        self.boxes = np.array(
+            [[[0, 20 * row], [width, 20 * row], [width, 20 * row + 10], [0, 20 * row + 10]] for row, width in enumerate(widths)],
+            dtype=np.float32,
+        ).reshape(-1, 4, 2)
+        self.labels = labels or {}
+        self.scores = scores or {}
+        self.ocr_result = ocr_result
+        self.classified: list[list[int]] = []
+        self.recognized: list[np.ndarray] = []
+        self.ocr_calls: list[bool] = []
+
+    def text_detector(self, _image):
+        return (self.boxes if len(self.boxes) else None), 0.0
+
+    def text_classifier(self, crops):
+        self.classified.append([crop.shape[1] for crop in crops])
+        return crops, [[self.labels.get(crop.shape[1], "0"), 0.99] for crop in crops], 0.0
+
+    def text_recognizer(self, crops):
+        self.recognized = crops
+        return [(f"w{crop.shape[1]}", self.scores.get(crop.shape[1], 0.95)) for crop in crops], 0.0
+
+    def ocr(self, _image, cls=True):
+        self.ocr_calls.append(cls)
+        return self.ocr_result
+
+
+def _paddle_backend(fake_ocr: FakePaddleOCR) -> PaddleBackend:
+    backend = PaddleBackend.__new__(PaddleBackend)
+    backend.settings = Settings()
+    backend._ocr = fake_ocr
+    backend._sorted_boxes = list
+    backend._crop = _crop
+    return backend
+
+
+def _page_image() -> np.ndarray:
+    image = np.zeros((100, 200, 3), dtype=np.uint8)
+    image[0, 0] = 255
+    return image
+
+
+def _crops(*widths: int) -> list[np.ndarray]:
+    crops = []
+    for width in widths:
+        crop = np.zeros((10, width, 3), dtype=np.uint8)
+        crop[0, 0] = 255
+        crops.append(crop)
+    return crops
+
+
+def test_engine_builds_blocks_from_backend_lines() -> None:
+    engine = OcrEngine(settings=Settings(enable_preprocess=False), backend=FakeBackend())
+    blocks = engine.ocr_image(np.zeros((10, 50, 3), dtype=np.uint8))
+
+    assert engine.info == "FakeOCR(cpu)"
+    assert blocks[0].text == "TOTAL 10,00"
+    assert blocks[0].confidence == 1.0
+    assert blocks[0].bbox[1] == [50.0, 0.0]
+
+
+def test_engine_passes_orientation_policy_and_counts_paths() -> None:
+    backend = FakeBackend()
+    engine = OcrEngine(settings=Settings(enable_preprocess=False, image_orientation="auto"), backend=backend)
+    image = np.zeros((10, 50, 3), dtype=np.uint8)
+    stats = OrientationStats(policy="auto")
+
+    engine.ocr_image(image, orientation="upright", stats=stats)
+    engine.ocr_image(image, orientation="cls", stats=stats)
+    engine.ocr_image(image, stats=stats)
+
+    assert backend.policies == ["upright", "cls", "auto"]
+    assert (stats.skipped, stats.classified, stats.upright, stats.rotated) == (1, 1, 0, 1)
+
+
+def test_page_consensus_upright_skips_per_crop_classifier() -> None:
+    classify = FakeClassifier({width: ("0", 0.99) for width in (30, 40, 50, 60, 70)})
+
+    boxes, crops, path = orient_crops(["a", "b", "c", "d", "e"], _crops(30, 70, 40, 60, 50), classify, "auto")
+
+    assert path == "upright"
+    assert classify.calls == [[70, 60, 50]]
+    assert boxes == ["a", "b", "c", "d", "e"]
+
+
+def test_page_consensus_rotated_flips_crops_and_reading_order() -> None:
+    classify = FakeClassifier({width: ("180", 0.97) for width in (30, 40, 50)})
+
+    boxes, crops, path = orient_crops(["a", "b", "c"], _crops(30, 40, 50), classify, "auto")
+
+    assert path == "rotated"
+    assert classify.calls == [[50, 40, 30]]
+    assert boxes == ["c", "b", "a"]
+    assert [crop.shape[1] for crop in crops] == [50, 40, 30]
+    assert all(crop[-1, -1, 0] == 255 for crop in crops)
+
+
+def test_ambiguous_page_falls_back_to_per_crop_classifier() -> None:
+    disagree = FakeClassifier({30: ("0", 0.99), 40: ("180", 0.99), 50: ("0", 0.99), 60: ("0", 0.99)})
+    low_score = FakeClassifier({30: ("0", 0.99), 40: ("0", 0.6), 50: ("0", 0.99)})
+
+    _, crops, path = orient_crops(["a", "b", "c", "d"], _crops(30, 40, 50, 60), disagree, "auto")
+    _, _, low_score_path = orient_crops(["a", "b", "c"], _crops(30, 40, 50), low_score, "auto")
+
+    assert path == "classified"
+    assert disagree.calls == [[60, 50, 40], [30, 40, 50, 60]]
+    assert crops[1][-1, -1, 0] == 255 and crops[0][0, 0, 0] == 255
+    assert low_score_path == "classified"
+
+
+def test_upright_policy_never_calls_classifier() -> None:
+    classify = FakeClassifier({})
+
+    _, _, path = orient_crops(["a"], _crops(30), classify, "upright")
+
+    assert path == "skipped"
+    assert classify.calls == []
+
+
+def test_paddle_auto_without_text_is_skipped() -> None:
+    fake = FakePaddleOCR()
+
+    lines, path = _paddle_backend(fake).run(_page_image(), orientation="auto")
+
+    assert (lines, path) == ([], "skipped")
+    assert fake.classified == []
+
+
+def test_paddle_auto_upright_consensus_skips_per_crop_classifier() -> None:
+    fake = FakePaddleOCR(widths=(40, 60, 50, 30))
+
+    lines, path = _paddle_backend(fake).run(_page_image(), orientation="auto")
+
+    assert path == "upright"
+    assert fake.classified == [[60, 50, 40]]
+    assert [text for _, text, _ in lines] == ["w40", "w60", "w50", "w30"]
+    assert lines[1][0] == [[0.0, 20.0], [60.0, 20.0], [60.0, 30.0], [0.0, 30.0]]
+
+
+def test_paddle_auto_rotated_consensus_flips_crops_and_reverses_boxes() -> None:
+    fake = FakePaddleOCR(widths=(40, 60, 50), labels={40: "180", 50: "180", 60: "180"})
+
+    lines, path = _paddle_backend(fake).run(_page_image(), orientation="auto")
+
+    assert path == "rotated"
+    assert fake.classified == [[60, 50, 40]]
+    assert [text for _, text, _ in lines] == ["w50", "w60", "w40"]
+    assert lines[0][0][0] == [0.0, 40.0]
+    # The first box starts at the page's marked top-left pixel; after the flip it sits bottom-right.
+    assert fake.recognized[-1][-1, -1, 0] == 255
+
+
+def test_paddle_auto_drops_lines_below_drop_score() -> None:
+    fake = FakePaddleOCR(widths=(40, 60, 50), scores={60: 0.3})
+
+    lines, _ = _paddle_backend(fake).run(_page_image(), orientation="auto")
+
+    assert [text for _, text, _ in lines] == ["w40", "w50"]
+
+
+def test_paddle_cls_and_upright_policies_call_ocr_with_cls_flag() -> None:
+    line = [[[0, 0], [50, 0], [50, 10], [0, 10]], ("TOTAL 10,00", 0.97)]
+    fake = FakePaddleOCR(ocr_result=[[line]])
+    backend = _paddle_backend(fake)
+
+    classified_lines, classified_path = backend.run(_page_image(), orientation="cls")
+    _, skipped_path = backend.run(_page_image(), orientation="upright")
+    fake.ocr_result = [None]
+    empty_lines, empty_path = backend.run(_page_image(), orientation="cls")
+
+    assert fake.ocr_calls == [True, False, True]
+    assert classified_lines == [([[0.0, 0.0], [50.0, 0.0], [50.0, 10.0], [0.0, 10.0]], "TOTAL 10,00", 0.97)]
+    assert (classified_path, skipped_path) == ("classified", "skipped")
+    assert (empty_lines, empty_path) == ([], "skipped")
+
+
+@pytest.mark.skipif(not ONNX_MODELS.is_file(), reason="modelos ONNX nao exportados")
+def test_onnx_backend_detects_sample_orientation() -> None:
+    from app.ocr.onnx_backend import OnnxBackend
+
+    backend = OnnxBackend(get_settings())
+    image = cv2.imread(str(SAMPLES_DIR / "nota.png"))
+
+    _, upright_path = backend.run(image, orientation="auto")
+    lines, rotated_path = backend.run(cv2.rotate(image, cv2.ROTATE_180), orientation="auto")
+
+    assert upright_path == "upright"
+    assert rotated_path == "rotated"
+    assert "SUPERMERCADO" in lines[0][1]
+
+
+def test_ctc_decode_collapses_repeats_and_blanks() -> None:
+    characters = ["blank", "a", "b", " "]
+    # Sequence: a a blank a b b -> "aab"
+    steps = [1, 1, 0, 1, 2, 2]
+    preds = np.full((1, len(steps), len(characters)), 0.05, dtype=np.float32)
+    for position, index in enumerate(steps):
+        preds[0, position, index] = 0.9
+
+    text, confidence = ctc_decode(preds, characters)[0]
+
+    assert text == "aab"
+    assert abs(confidence - 0.9) < 1e-6
+
+
+def test_db_postprocess_scales_boxes_to_destination() -> None:
+    pred = np.zeros((100, 200), dtype=np.float32)
+    pred[40:60, 20:120] = 0.9
+
+    boxes = db_postprocess(pred, dest_width=400, dest_height=200)
+
+    # Region spans x 20..119, y 40..59; unclip grows it by 99*19*1.5/236 ~= 11.96 px, then x2 to the page.
+    assert len(boxes) == 1
+    assert boxes[0].tolist() == [[16.0, 56.0], [262.0, 56.0], [262.0, 142.0], [16.0, 142.0]]
+
+
+def test_db_postprocess_drops_low_score_regions() -> None:
+    pred = np.zeros((100, 200), dtype=np.float32)
+    pred[40:60, 20:120] = 0.4
+
+    assert db_postprocess(pred, dest_width=200, dest_height=100) == []
+
+
+def test_unclip_grows_rectangle_by_offset_distance() -> None:
+    box = np.array([[0, 0], [100, 0], [100, 20], [0, 20]], dtype=np.float32)
+
+    grown = _unclip(box)
+
+    # distance = area * 1.5 / perimeter = 2000 * 1.5 / 240 = 12.5 on every side.
+    assert grown[:, 0].min() == -12.5 and grown[:, 0].max() == 112.5
+    assert grown[:, 1].min() == -12.5 and grown[:, 1].max() == 32.5
+
+
+def test_mini_box_orders_points_clockwise_from_top_left() -> None:
+    points = np.array([[100, 20], [0, 0], [0, 20], [100, 0]], dtype=np.float32)
+
+    box, short_side = _mini_box(points)
+
+    assert np.allclose(box, [[0, 0], [100, 0], [100, 20], [0, 20]])
+    assert short_side == 20.0
+
+
+def test_sort_boxes_reads_same_line_left_to_right() -> None:
+    def box(x: float, y: float) -> np.ndarray:
+        return np.array([[x, y], [x + 40, y], [x + 40, y + 15], [x, y + 15]], dtype=np.float32)
+
+    ordered = _sort_boxes([box(10, 50), box(100, 10), box(10, 14)])
+
+    assert [tuple(item[0]) for item in ordered] == [(10.0, 14.0), (100.0, 10.0), (10.0, 50.0)]
+
+
+def test_crop_rectifies_box_and_rotates_vertical_text() -> None:
+    image = np.zeros((100, 200, 3), dtype=np.uint8)
+    image[:, :, 0] = np.arange(200, dtype=np.uint8)[np.newaxis, :]
+
+    horizontal = _crop(image, np.array([[20, 10], [120, 10], [120, 30], [20, 30]], dtype=np.float32))
+    vertical = _crop(image, np.array([[50, 10], [60, 10], [60, 90], [50, 90]], dtype=np.float32))
+
+    assert horizontal.shape == (20, 100, 3)
+    assert horizontal[10, 0, 0] == 20 and horizontal[10, 99, 0] == 119
+    assert vertical.shape == (10, 80, 3)
@@ -1,9 +1,11 @@
+import json
 from io import BytesIO
 
 from fastapi.testclient import TestClient
 from PIL import Image, ImageDraw
 
 from app.api.routes.ocr import get_ocr_engine
+from app.core.config import get_settings
 from app.main import app
 from app.ocr.schemas import Block
 
@@ -11,7 +13,7 @@ from app.ocr.schemas import Block
 class MockEngine:
     info = "MockOCR(cpu)"
 
-    def ocr_image(self, _image):
+    def ocr_image(self, _image, **_kwargs):
         return [
             Block(
                 bbox=[[0.0, 0.0], [100.0, 0.0], [100.0, 20.0], [0.0, 20.0]],
@@ -20,14 +22,14 @@ class MockEngine:
             )
         ]
 
-    def ocr_pdf(self, _bytes):
+    def ocr_pdf(self, _bytes, **_kwargs):
         return []
 
 
 class FieldsMockEngine:
     info = "MockOCR(cpu)"
 
-    def ocr_image(self, _image):
+    def ocr_image(self, _image, **_kwargs):
         return [
             Block(
                 bbox=[[0.0, 0.0], [90.0, 0.0], [90.0, 20.0], [0.0, 20.0]],
@@ -51,7 +53,7 @@ class FieldsMockEngine:
             ),
         ]
 
-    def ocr_pdf(self, _bytes):
+    def ocr_pdf(self, _bytes, **_kwargs):
         return []
 
 
@@ -106,3 +108,61 @@ def test_ocr_fields_extracts_structured_fields() -> None:
     assert body["fields"]["date"]["value"] == "12/01/2026"
     assert body["fields"]["total"]["value"] == "10,00"
     assert body["fields"]["cnpj_cpf"]["value"] == "12.345.678/0001-95"
+
+
+def test_ocr_image_reports_orientation_policy() -> None:
+    app.dependency_overrides[get_ocr_engine] = lambda: MockEngine()
+    client = TestClient(app)
+    try:
+        payload = _create_test_image()
+        response = client.post(
+            "/ocr/image", params={"orientation": "cls"}, files={"file": ("teste.png", payload, "image/png")}
+        )
+        invalid = client.post(
+            "/ocr/image", params={"orientation": "sideways"}, files={"file": ("teste.png", payload, "image/png")}
+        )
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert response.json()["orientation"]["policy"] == "cls"
+    assert invalid.status_code == 422
+
+
+def test_profile_header_returns_stage_timings() -> None:
+    app.dependency_overrides[get_ocr_engine] = lambda: MockEngine()
+    client = TestClient(app)
+    try:
+        payload = _create_test_image()
+        profiled = client.post(
+            "/ocr/fields", headers={"X-Profile": "1"}, files={"file": ("teste.png", payload, "image/png")}
+        )
+        plain = client.post("/ocr/fields", files={"file": ("teste.png", payload, "image/png")})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert profiled.status_code == 200
+    assert "decode;dur=" in profiled.headers["Server-Timing"]
+    assert "fields;dur=" in profiled.headers["Server-Timing"]
+    assert "Server-Timing" not in plain.headers
+
+
+def test_slow_request_is_captured(monkeypatch, tmp_path) -> None:
+    settings = get_settings()
+    monkeypatch.setattr(settings, "slow_request_ms", 0.001)
+    monkeypatch.setattr(settings, "slow_capture_dir", str(tmp_path))
+    app.dependency_overrides[get_ocr_engine] = lambda: MockEngine()
+    client = TestClient(app)
+    try:
+        response = client.post("/ocr/fields", files={"file": ("teste.png", _create_test_image(), "image/png")})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    captures = list(tmp_path.glob("*.json"))
+    assert len(captures) == 1
+    capture = json.loads(captures[0].read_text(encoding="utf-8"))
+    assert capture["request_id"] == response.headers["X-Request-ID"]
+    assert capture["path"] == "/ocr/fields"
+    assert capture["metadata"]["content_type"] == "image/png"
+    assert "decode" in capture["totals"]
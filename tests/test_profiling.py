@@ -0,0 +1,35 @@
+from time import perf_counter, sleep
+
+from app.core.config import get_settings
+from app.core.profiling import RequestProfile, StackSampler, write_capture
+
+
+def test_capture_directory_is_bounded(monkeypatch, tmp_path) -> None:
+    settings = get_settings()
+    monkeypatch.setattr(settings, "slow_capture_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "slow_capture_max_files", 2)
+
+    for index in range(4):
+        profile = RequestProfile(f"req-{index}", report=False, keep_input=True)
+        profile.input = b"payload"
+        write_capture(profile, settings, duration_ms=1.0)
+
+    remaining = sorted(path.name for path in tmp_path.iterdir())
+    assert len([name for name in remaining if name.endswith(".json")]) == 2
+    assert len([name for name in remaining if name.endswith(".input")]) == 2
+    assert all("req-2" in name or "req-3" in name for name in remaining)
+
+
+def test_stack_sampler_records_registered_thread() -> None:
+    sampler = StackSampler(interval_ms=1)
+    profile = RequestProfile("req", report=False)
+
+    sampler.register(profile)
+    deadline = perf_counter() + 0.2
+    while perf_counter() < deadline:
+        sum(range(1000))
+    sampler.unregister(profile)
+    sleep(0.01)
+
+    assert sum(profile.stacks.values()) > 0
+    assert any("test_stack_sampler_records_registered_thread" in stack for stack in profile.stacks)